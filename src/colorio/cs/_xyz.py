@@ -3,6 +3,8 @@ XYZ colorspace.
 
 https://en.wikipedia.org/wiki/CIE_1931_color_space
 """
+from typing import Optional
+
 import numpy as np
 from numpy.typing import ArrayLike
 
@@ -20,19 +22,35 @@ class XYZ(ColorSpace):
             raise ColorioError("scaling needs to be 1 or 100.")
 
         self.scaling = scaling
+        # conversion factors from and to XYZ100; 1.0 means the identity
+        self._from_factor = 1.0 if scaling == 100 else 0.01
+        self._to_factor = 1.0 if scaling == 100 else 100.0
 
-    def from_xyz100(self, xyz: ArrayLike) -> np.ndarray:
-        xyz = np.asarray(xyz)
-        if self.scaling == 100:
-            return xyz
-
-        return xyz / 100
+    def from_xyz100(
+        self, xyz: ArrayLike, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """If `out` is given, the result is written into it; `out=xyz` converts in
+        place.
+        """
+        if self._from_factor == 1.0:
+            if out is None:
+                return np.asarray(xyz)
+            if out is not xyz:
+                out[...] = xyz
+            return out
+        return np.multiply(xyz, self._from_factor, out=out)
 
-    def to_xyz100(self, xyz: ArrayLike) -> np.ndarray:
-        xyz = np.asarray(xyz)
-        if self.scaling == 100:
-            return xyz
-        return xyz * 100
+    def to_xyz100(self, xyz: ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """If `out` is given, the result is written into it; `out=xyz` converts in
+        place.
+        """
+        if self._to_factor == 1.0:
+            if out is None:
+                return np.asarray(xyz)
+            if out is not xyz:
+                out[...] = xyz
+            return out
+        return np.multiply(xyz, self._to_factor, out=out)
 
 
 class XYZ1(XYZ):
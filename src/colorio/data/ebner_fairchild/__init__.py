@@ -4,6 +4,7 @@ Finding Constant Hue Surfaces in Color Space,
 SPIE/IS&T Electronic Imaging, (1998),
 <https://doi.org/10.1117/12.298269>.
 """
+import functools
 import json
 import pathlib
 
@@ -12,16 +13,28 @@ import numpy as np
 from ..hue_linearity import HueLinearityDataset
 
 
+@functools.lru_cache(maxsize=1)
+def _load():
+    this_dir = pathlib.Path(__file__).resolve().parent
+    with open(this_dir / "ebner_fairchild.json") as f:
+        data = json.load(f)
+
+    whitepoint = np.array(data["white point"])
+    arms = [
+        np.column_stack([dat["reference xyz"], np.array(dat["same"]).T])
+        for dat in data["data"]
+    ]
+    # The arrays are shared between instances; make sure nobody alters them.
+    whitepoint.setflags(write=False)
+    for arm in arms:
+        arm.setflags(write=False)
+    return whitepoint, tuple(arms)
+
+
 class EbnerFairchild(HueLinearityDataset):
     def __init__(self):
-        this_dir = pathlib.Path(__file__).resolve().parent
-        with open(this_dir / "ebner_fairchild.json") as f:
-            data = json.load(f)
-
-        arms = [
-            np.column_stack([dat["reference xyz"], np.array(dat["same"]).T])
-            for dat in data["data"]
-        ]
+        whitepoint, arms = _load()
+        arms = list(arms)
 
         # From the article:
         #
@@ -44,4 +57,4 @@ class EbnerFairchild(HueLinearityDataset):
         self.c = 0.525  # "dark"
         self.Y_b = 35
 
-        super().__init__("Ebner-Fairchild", data["white point"], arms)
+        super().__init__("Ebner-Fairchild", whitepoint, arms)
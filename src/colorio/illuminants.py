@@ -1,34 +1,62 @@
+import functools
 import json
 import pathlib
 
 import numpy as np
+from numpy.typing import ArrayLike
 
 from . import observers
+from ._exceptions import ColorioError
+
+this_dir = pathlib.Path(__file__).resolve().parent
+
+# The default wavelength grid, 300 nm to 830 nm in steps of 1 nm, and the values of
+# illuminant E on it. Shared between calls, so read-only.
+_LMBDA_300_830 = 1.0e-9 * np.arange(300, 831)
+_LMBDA_300_830.setflags(write=False)
+_E_VALS = np.full(_LMBDA_300_830.shape, 100.0)
+_E_VALS.setflags(write=False)
+_LMBDA_300_830_POW5 = _LMBDA_300_830 ** 5
+_LMBDA_300_830_POW5.setflags(write=False)
 
 # The "standard" 2 degree observer (CIE 1931). From
 # <https://github.com/njsmith/colorspacious/blob/master/colorspacious/illuminants.py>
+# The white points are stored in one contiguous table, one row per illuminant; the
+# dictionary entries are views into it.
+whitepoints_cie1931_index = {"A": 0, "C": 1, "D50": 2, "D55": 3, "D65": 4, "D75": 5}
+whitepoints_cie1931_table = np.array(
+    [
+        [109.850, 100, 35.585],
+        [98.074, 100, 118.232],
+        [96.422, 100, 82.521],
+        [95.682, 100, 92.149],
+        [95.047, 100, 108.883],
+        [94.972, 100, 122.638],
+    ]
+)
 whitepoints_cie1931 = {
-    "A": np.array([109.850, 100, 35.585]),
-    "C": np.array([98.074, 100, 118.232]),
-    "D50": np.array([96.422, 100, 82.521]),
-    "D55": np.array([95.682, 100, 92.149]),
-    "D65": np.array([95.047, 100, 108.883]),
-    "D75": np.array([94.972, 100, 122.638]),
+    name: whitepoints_cie1931_table[i] for name, i in whitepoints_cie1931_index.items()
 }
 
 # The "supplementary" 10 degree observer (CIE 1964). From
 # <https://github.com/njsmith/colorspacious/blob/master/colorspacious/illuminants.py>
+whitepoints_cie1964_index = {"A": 0, "C": 1, "D50": 2, "D55": 3, "D65": 4, "D75": 5}
+whitepoints_cie1964_table = np.array(
+    [
+        [111.144, 100, 35.200],
+        [97.285, 100, 116.145],
+        [96.720, 100, 81.427],
+        [95.799, 100, 90.926],
+        [94.811, 100, 107.304],
+        [94.416, 100, 120.641],
+    ]
+)
 whitepoints_cie1964 = {
-    "A": np.array([111.144, 100, 35.200]),
-    "C": np.array([97.285, 100, 116.145]),
-    "D50": np.array([96.720, 100, 81.427]),
-    "D55": np.array([95.799, 100, 90.926]),
-    "D65": np.array([94.811, 100, 107.304]),
-    "D75": np.array([94.416, 100, 120.641]),
+    name: whitepoints_cie1964_table[i] for name, i in whitepoints_cie1964_index.items()
 }
 
 
-def spectrum_to_xyz100(spectrum, observer):
+def spectrum_to_xyz100(spectrum, observer, validate: bool = True):
     """Computes the tristimulus values XYZ from a given spectrum for a given observer
     via
 
@@ -67,21 +95,24 @@ def spectrum_to_xyz100(spectrum, observer):
 
     Note that any constant factor (like delta_lambda) gets canceled out in x and y (of
     xyY), so being careless might not be punished in all applications.
+
+    With validate=False, the check that the wavelengths cover 360 nm to 830 nm is
+    skipped.
     """
     lambda_o, data_o = observer
     lambda_s, data_s = spectrum
 
-    # form the union of lambdas
-    lmbda = np.sort(np.unique(np.concatenate([lambda_o, lambda_s])))
+    # form the union of lambdas; np.unique already sorts
+    lmbda = np.unique(np.concatenate([lambda_o, lambda_s]))
 
     # The technical document prescribes that the integration be performed over
     # the wavelength range corresponding to the entire visible spectrum, 360 nm
     # to 830 nm.
-    assert lmbda[0] < 361e-9
-    assert lmbda[-1] > 829e-9
+    if validate:
+        _check_range(lmbda)
 
     # interpolate data
-    idata_o = np.array([np.interp(lmbda, lambda_o, dt) for dt in data_o])
+    idata_o = _interp_rows(lmbda, lambda_o, data_o)
     # The technical report specifies the interpolation techniques, too:
     # ```
     # Use one of the four following methods to calculate needed but unmeasured
@@ -95,34 +126,112 @@ def spectrum_to_xyz100(spectrum, observer):
     # ```
     # Well, don't do that but simply use linear interpolation now. We only use the
     # midpoint rule for integration anyways.
-    idata_s = np.interp(lmbda, lambda_s, data_s)
+    #
+    # Fold the step sizes into the interpolated spectrum right away.
+    delta = _step_sizes(lmbda)
+    if len(lambda_s) == len(lmbda) and np.array_equal(lambda_s, lmbda):
+        # the spectrum is already given on the union grid
+        weights = np.multiply(data_s, delta)
+    elif np.ndim(data_s) == 2:
+        # batch of spectra, see spectrum_to_xyz100_batch
+        weights = _interp_rows(lmbda, lambda_s, data_s)
+        weights *= delta
+    else:
+        weights = np.interp(lmbda, lambda_s, data_s)
+        weights *= delta
+
+    values = weights @ idata_o.T
+    values *= 100
+    return values
+
+
+def spectrum_to_xyz100_batch(spectra, observer, validate: bool = True):
+    """Same as spectrum_to_xyz100, but for many spectra at once. All spectra must be
+    given on the same wavelengths, i.e., spectra = (lambda_s, data_s) with data_s of
+    shape (B, N). Returns the tristimulus values as an array of shape (B, 3).
+
+    The observer is interpolated only once for the whole batch.
+    """
+    if np.ndim(spectra[1]) != 2:
+        raise ColorioError("Spectrum data needs to be of shape (B, N).")
+    return spectrum_to_xyz100(spectra, observer, validate)
+
+
+class ObserverCache:
+    """Precomputed observer data for evaluating many spectra that are all given on the
+    same wavelengths `lmbda`. Calling the instance with spectrum values of shape (N,)
+    or (B, N) gives the same as spectrum_to_xyz100((lmbda, data), observer), but the
+    work reduces to a single matrix product.
+    """
+
+    def __init__(self, observer, lmbda: ArrayLike, validate: bool = True):
+        lambda_o, data_o = observer
+        lmbda = np.asarray(lmbda)
+
+        grid = np.unique(np.concatenate([lambda_o, lmbda]))
+        if validate:
+            _check_range(grid)
+
+        w = _interp_rows(grid, lambda_o, data_o)
+        w *= _step_sizes(grid)
+        w *= 100
+
+        # The linear interpolation of the spectrum from lmbda onto the grid is a linear
+        # map, too; fold it into the observer matrix.
+        idx = np.clip(np.searchsorted(lmbda, grid) - 1, 0, len(lmbda) - 2)
+        t = (grid - lmbda[idx]) / (lmbda[idx + 1] - lmbda[idx])
+        t = np.clip(t, 0.0, 1.0)
+        m = np.zeros((len(lmbda), 3))
+        np.add.at(m, idx, (w * (1 - t)).T)
+        np.add.at(m, idx + 1, (w * t).T)
+        self.lmbda = lmbda
+        # shape (N, 3), such that data @ self.matrix gives the XYZ100 values
+        self.matrix = m
+
+    def __call__(self, data: ArrayLike) -> np.ndarray:
+        return np.asarray(data) @ self.matrix
+
+
+def _check_range(lmbda):
+    if lmbda[0] >= 361e-9 or lmbda[-1] <= 829e-9:
+        raise ColorioError(
+            "Wavelengths need to cover the visible spectrum, 360 nm to 830 nm."
+        )
 
-    # step sizes
-    delta = np.zeros(len(lmbda))
-    diff = lmbda[1:] - lmbda[:-1]
-    delta[1:] += diff
-    delta[:-1] += diff
-    delta /= 2
 
-    values = np.dot(idata_o, idata_s * delta)
+def _interp_rows(x, xp, fp):
+    """Linear interpolation of all rows of fp onto x."""
+    return np.array([np.interp(x, xp, row) for row in fp])
 
-    return values * 100
+
+def _step_sizes(lmbda):
+    delta = np.empty_like(lmbda)
+    delta[1:-1] = 0.5 * (lmbda[2:] - lmbda[:-2])
+    delta[0] = 0.5 * (lmbda[1] - lmbda[0])
+    delta[-1] = 0.5 * (lmbda[-1] - lmbda[-2])
+    return delta
 
 
 def white_point(illuminant, observer=observers.cie_1931_2()):
     """From <https://en.wikipedia.org/wiki/White_point>:
     The white point of an illuminant is the chromaticity of a white object under the
     illuminant.
+
+    If the illuminant data is of shape (B, N), i.e., B spectra on common wavelengths,
+    the B white points are computed at once and returned as an array of shape (B, 3).
     """
-    values = spectrum_to_xyz100(illuminant, observer)
-    # normalize for relative luminance, Y=100
-    values /= values[1]
-    values *= 100
+    if np.ndim(illuminant[1]) == 2:
+        values = spectrum_to_xyz100_batch(illuminant, observer)
+    else:
+        values = spectrum_to_xyz100(illuminant, observer)
+    # normalize for relative luminance, Y=100; values is a fresh array, so scale it in
+    # place in one pass
+    values *= 100.0 / values[..., 1:2]
     return values
 
 
 def planckian_radiator(temperature):
-    lmbda = 1.0e-9 * np.arange(300, 831)
+    lmbda = _LMBDA_300_830
     # light speed
     c = 299792458.0
     # Plank constant
@@ -131,7 +240,12 @@ def planckian_radiator(temperature):
     k = 1.38064852e-23
     c1 = 2 * np.pi * h * c ** 2
     c2 = h * c / k
-    return lmbda, c1 / lmbda ** 5 / (np.exp(c2 / lmbda / temperature) - 1)
+    # c1 / lmbda ** 5 / (exp(c2 / lmbda / temperature) - 1), evaluated in place;
+    # expm1 is more accurate than exp(x) - 1 for small x
+    vals = np.expm1(c2 / (lmbda * temperature))
+    vals *= _LMBDA_300_830_POW5
+    np.divide(c1, vals, out=vals)
+    return lmbda, vals
 
 
 def a(interval=1.0e-9):
@@ -144,18 +258,18 @@ def a(interval=1.0e-9):
     illuminant.
     """
     # https://en.wikipedia.org/wiki/Standard_illuminant#Illuminant_A
-    lmbda = np.arange(300e-9, 831e-9, interval)
+    if interval == 1.0e-9:
+        lmbda = _LMBDA_300_830
+    else:
+        lmbda = np.arange(300e-9, 831e-9, interval)
     c2 = 1.435e-2
     color_temp = 2848
-    np.exp(c2 / (color_temp * 560e-9))
-    vals = (
-        100
-        * (560e-9 / lmbda) ** 5
-        * (
-            (np.exp(c2 / (color_temp * 560e-9)) - 1)
-            / (np.exp(c2 / (color_temp * lmbda)) - 1)
-        )
-    )
+    # 100 * (560e-9 / lmbda) ** 5 * (exp(c2 / (T * 560e-9)) - 1)
+    #     / (exp(c2 / (T * lmbda)) - 1),
+    # evaluated in place
+    vals = np.expm1(c2 / (color_temp * lmbda))
+    np.divide(100 * np.expm1(c2 / (color_temp * 560e-9)), vals, out=vals)
+    vals *= (560e-9 / lmbda) ** 5
     return lmbda, vals
 
 
@@ -183,29 +297,39 @@ def d(nominal_temperature: float):
     #   intermediate wavelengths.
     tcp = 1.4388e-2 / 1.4380e-2 * nominal_temperature
 
+    # Horner scheme in 1/tcp
+    inv = 1.0 / tcp
     if 4000 <= tcp <= 7000:
-        xd = ((-4.6070e9 / tcp + 2.9678e6) / tcp + 0.09911e3) / tcp + 0.244063
+        xd = ((-4.6070e9 * inv + 2.9678e6) * inv + 0.09911e3) * inv + 0.244063
     else:
         assert 7000 < tcp <= 25000
-        xd = ((-2.0064e9 / tcp + 1.9018e6) / tcp + 0.24748e3) / tcp + 0.237040
+        xd = ((-2.0064e9 * inv + 1.9018e6) * inv + 0.24748e3) * inv + 0.237040
 
     yd = (-3.000 * xd + 2.870) * xd - 0.275
 
     m1 = (-1.3515 - 1.7703 * xd + 5.9114 * yd) / (0.0241 + 0.2562 * xd - 0.7341 * yd)
     m2 = (+0.0300 - 31.4424 * xd + 30.0717 * yd) / (0.0241 + 0.2562 * xd - 0.7341 * yd)
 
-    m1 = np.around(m1, decimals=3)
-    m2 = np.around(m2, decimals=3)
+    m1 = round(m1, 3)
+    m2 = round(m2, 3)
+
+    lmbda, s = _load_d_table()
+
+    # s[0] + m1 * s[1] + m2 * s[2] in one pass over s
+    return lmbda, np.array([1.0, m1, m2]) @ s
 
-    this_dir = pathlib.Path(__file__).resolve().parent
+
+@functools.lru_cache(maxsize=1)
+def _load_d_table():
+    """Wavelengths and S0, S1, S2 components of the D-series illuminants."""
     with open(this_dir / "data/illuminants/d.json") as f:
         data = json.load(f)
-
-    print(data)
     lmbda = np.linspace(*data["lambda"], data["num"])
     s = np.asarray(data["s"])
-
-    return lmbda, s[0] + m1 * s[1] + m2 * s[2]
+    # The arrays are shared between calls; make sure nobody alters them.
+    lmbda.setflags(write=False)
+    s.setflags(write=False)
+    return lmbda, s
 
 
 def d50():
@@ -232,13 +356,19 @@ def e():
     """This is a hypothetical reference radiator. All wavelengths in CIE illuminant E
     are weighted equally with a relative spectral power of 100.0.
     """
-    lmbda = 1.0e-9 * np.arange(300, 831)
-    data = np.full(lmbda.shape, 100.0)
-    return lmbda, data
+    return _LMBDA_300_830, _E_VALS
 
 
-def f2():
-    this_dir = pathlib.Path(__file__).resolve().parent
+@functools.lru_cache(maxsize=1)
+def _load_f2_table():
     with open(this_dir / "data/illuminants/f2.json") as f:
         data = json.load(f)
-    return np.linspace(*data["lambda"], data["num"]), np.array(data["values"])
+    lmbda = np.linspace(*data["lambda"], data["num"])
+    values = np.array(data["values"])
+    lmbda.setflags(write=False)
+    values.setflags(write=False)
+    return lmbda, values
+
+
+def f2():
+    return _load_f2_table()
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+import colorio
+
+
+@pytest.mark.parametrize(
+    "cs,factor", [(colorio.cs.XYZ1(), 0.01), (colorio.cs.XYZ100(), 1.0)]
+)
+def test_out(cs, factor):
+    xyz100 = np.array([95.047, 100.0, 108.883])
+
+    # separate output array
+    out = np.empty(3)
+    res = cs.from_xyz100(xyz100, out=out)
+    assert res is out
+    assert np.all(abs(out - factor * xyz100) < 1.0e-14 * xyz100)
+    res = cs.to_xyz100(out.copy(), out=out)
+    assert res is out
+    assert np.all(abs(out - xyz100) < 1.0e-14 * xyz100)
+
+    # in place
+    xyz = xyz100.copy()
+    res = cs.from_xyz100(xyz, out=xyz)
+    assert res is xyz
+    assert np.all(abs(xyz - factor * xyz100) < 1.0e-14 * xyz100)
+    res = cs.to_xyz100(xyz, out=xyz)
+    assert res is xyz
+    assert np.all(abs(xyz - xyz100) < 1.0e-14 * xyz100)
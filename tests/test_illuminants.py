@@ -55,6 +55,42 @@ def test_spectrum_to_xyz100():
     colorio.illuminants.spectrum_to_xyz100(spectrum, observer)
 
 
+def test_spectrum_to_xyz100_range():
+    lmbda = np.linspace(400e-9, 700e-9, 31)
+    spectrum = (lmbda, np.ones(31))
+    observer = (lmbda, np.ones((3, 31)))
+    with pytest.raises(colorio.ColorioError):
+        colorio.illuminants.spectrum_to_xyz100(spectrum, observer)
+    colorio.illuminants.spectrum_to_xyz100(spectrum, observer, validate=False)
+
+
+def test_spectrum_to_xyz100_batch():
+    spectra = [colorio.illuminants.d(t) for t in [5000, 6500, 7500]]
+    lmbda = spectra[0][0]
+    data = np.array([s[1] for s in spectra])
+    observer = colorio.observers.cie_1931_2()
+
+    values = colorio.illuminants.spectrum_to_xyz100_batch((lmbda, data), observer)
+    ref = [colorio.illuminants.spectrum_to_xyz100(s, observer) for s in spectra]
+    assert values.shape == (3, 3)
+    assert np.all(abs(values - ref) < 1.0e-12 * abs(np.array(ref)))
+
+    values = colorio.illuminants.white_point((lmbda, data))
+    ref = [colorio.illuminants.white_point(s) for s in spectra]
+    assert np.all(abs(values - ref) < 1.0e-12 * abs(np.array(ref)))
+
+
+def test_observer_cache():
+    spectra = [colorio.illuminants.d(t) for t in [5000, 6500, 7500]]
+    lmbda = spectra[0][0]
+    observer = colorio.observers.cie_1931_2()
+
+    cache = colorio.illuminants.ObserverCache(observer, lmbda)
+    for s in spectra:
+        ref = colorio.illuminants.spectrum_to_xyz100(s, observer)
+        assert np.all(abs(cache(s[1]) - ref) < 1.0e-12 * abs(ref))
+
+
 if __name__ == "__main__":
     # test_white_point()
     test_show()